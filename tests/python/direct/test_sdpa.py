@@ -3,11 +3,11 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # Owner(s): ["module: nvfuser"]
 
-import itertools
 import math
 import pytest
 import torch
 import torch.nn.functional as F
+from torch.nn.attention import SDPBackend, sdpa_kernel
 from enum import Enum, auto
 from functools import partial
 
@@ -21,6 +21,41 @@ from python.direct_utils import (
     verify_stride_order,
 )
 
+# Problem size and values of the optional arguments swept by test_sdpa_fwd,
+# test_sdpa_bwd and test_sdpa_fwd_bwd. The sweep covers the API, so the size is
+# kept minimal; test_sdpa_fwd_large_shape covers a realistic size.
+N, H, L, S, E = 1, 1, 8, 8, 8
+dropout_vals = [None, 0.0, 0.2]
+is_causal_vals = [None, True, False]
+scale_vals = [None, 1 / E**0.5, 1e-3]
+
+
+# Inputs are created once and shared by all parametrizations. Tests must not
+# modify them in place. A dedicated, seeded generator makes them identical
+# across runs and pytest-xdist workers regardless of test order.
+@pytest.fixture(scope="module")
+def sdpa_inputs():
+    gen = torch.Generator(device="cuda")
+    gen.manual_seed(0)
+    q = torch.randn((N, H, L, E), dtype=torch.bfloat16, device="cuda", generator=gen)
+    k = torch.randn((N, H, S, E), dtype=torch.bfloat16, device="cuda", generator=gen)
+    v = torch.randn((N, H, S, E), dtype=torch.bfloat16, device="cuda", generator=gen)
+    grad_output = torch.randn(
+        (N, H, L, E), dtype=torch.bfloat16, device="cuda", generator=gen
+    )
+    return q, k, v, grad_output
+
+
+# Defines a contiguous, symbolic-shape CUDA tensor, as used by the SDPA fusions
+# below.
+def _define_tensor(fd: FusionDefinition, ndims: int = 4, dtype=DataType.BFloat16):
+    return fd.define_tensor(
+        shape=[-1] * ndims,
+        contiguity=True,
+        dtype=dtype,
+        is_cpu=False,
+    )
+
 
 @pytest.mark.skipif(
     is_pre_ampere(),
@@ -54,8 +89,6 @@ def test_softmax_logsumexp(nvfuser_direct_test):
         torch.ones((n, h, s, e), dtype=torch.bfloat16, device="cuda"),
     ]
 
-    from torch.nn.attention import SDPBackend, sdpa_kernel
-
     with sdpa_kernel(SDPBackend.FLASH_ATTENTION):
         nvf_out, _ = nvfuser_direct_test.exec_nvfuser(
             fusion_func,
@@ -65,7 +98,7 @@ def test_softmax_logsumexp(nvfuser_direct_test):
     # matrix full of `sqrt(e)`s.  Therefore, the logsumexp of each row is
     # expected to be log(exp(sqrt(e)) * s) = log(s) + sqrt(e).
     torch.testing.assert_close(
-        nvf_out[0].cpu(), torch.full((n, h, l), math.log(s) + e**0.5)
+        nvf_out[0], torch.full((n, h, l), math.log(s) + e**0.5, device="cuda")
     )
 
 
@@ -73,28 +106,17 @@ def test_softmax_logsumexp(nvfuser_direct_test):
     is_pre_ampere(),
     reason="Flash Attention is only supported on Ampere and newer devices.",
 )
-def test_sdpa_fwd(nvfuser_direct_test):
+# TODO: Try to move this to pytest_ops.py. Currently, it does not work since the API between nvFuser and torch differs.
+@pytest.mark.parametrize("dropout_p", dropout_vals)
+@pytest.mark.parametrize("is_causal", is_causal_vals)
+@pytest.mark.parametrize("scale", scale_vals)
+def test_sdpa_fwd(nvfuser_direct_test, sdpa_inputs, dropout_p, is_causal, scale):
     def fusion_func(
         fd: FusionDefinition, has_dropout: bool, has_causal: bool, has_scale: bool
     ):
-        q = fd.define_tensor(
-            shape=[-1, -1, -1, -1],
-            contiguity=True,
-            dtype=DataType.BFloat16,
-            is_cpu=False,
-        )
-        k = fd.define_tensor(
-            shape=[-1, -1, -1, -1],
-            contiguity=True,
-            dtype=DataType.BFloat16,
-            is_cpu=False,
-        )
-        v = fd.define_tensor(
-            shape=[-1, -1, -1, -1],
-            contiguity=True,
-            dtype=DataType.BFloat16,
-            is_cpu=False,
-        )
+        q = _define_tensor(fd)
+        k = _define_tensor(fd)
+        v = _define_tensor(fd)
         dropout_p, is_causal, scale = None, None, None
         if has_dropout:
             dropout_p = fd.define_scalar(value=None, dtype=DataType.Double)
@@ -107,53 +129,68 @@ def test_sdpa_fwd(nvfuser_direct_test):
         )
         fd.add_output(attn)
 
-    N, H, L, S, E = 4, 8, 16, 16, 8
+    qkv = sdpa_inputs[:3]
+
+    has_dropout = True if dropout_p is not None else False
+    has_causal = True if is_causal is not None else False
+    has_scale = True if scale is not None else False
+    inputs = [*qkv, *(p for p in (dropout_p, is_causal, scale) if p is not None)]
+    nvf_out, _ = nvfuser_direct_test.exec_nvfuser(
+        partial(
+            fusion_func,
+            has_dropout=has_dropout,
+            has_causal=has_causal,
+            has_scale=has_scale,
+        ),
+        inputs,
+        new_fusion_expected=None,
+    )
+
+    # Torch does not accept NoneType dropout_p, is_causal.
+    dropout_p = 0.0 if dropout_p is None else dropout_p
+    is_causal = False if is_causal is None else is_causal
+
+    with sdpa_kernel(SDPBackend.FLASH_ATTENTION):
+        torch.manual_seed(0)
+        ref_out = F.scaled_dot_product_attention(
+            *qkv, dropout_p=dropout_p, is_causal=is_causal, scale=scale
+        )
+    torch.testing.assert_close(nvf_out[0], ref_out)
+
+
+@pytest.mark.skipif(
+    is_pre_ampere(),
+    reason="Flash Attention is only supported on Ampere and newer devices.",
+)
+def test_sdpa_fwd_large_shape(nvfuser_direct_test):
+    def fusion_func(fd: FusionDefinition):
+        q = _define_tensor(fd)
+        k = _define_tensor(fd)
+        v = _define_tensor(fd)
+        dropout_p = fd.define_scalar(value=None, dtype=DataType.Double)
+        is_causal = fd.define_scalar(value=None, dtype=DataType.Bool)
+        attn, *_ = fd.ops.sdpfa_fwd(
+            q, k, v, dropout_p=dropout_p, is_causal=is_causal, scale=None
+        )
+        fd.add_output(attn)
+
+    n, h, l, s, e = 4, 8, 128, 128, 64
+    gen = torch.Generator(device="cuda")
+    gen.manual_seed(0)
     qkv = [
-        torch.randn((N, H, L, E), dtype=torch.bfloat16, device="cuda"),
-        torch.randn((N, H, S, E), dtype=torch.bfloat16, device="cuda"),
-        torch.randn((N, H, S, E), dtype=torch.bfloat16, device="cuda"),
+        torch.randn((n, h, l, e), dtype=torch.bfloat16, device="cuda", generator=gen),
+        torch.randn((n, h, s, e), dtype=torch.bfloat16, device="cuda", generator=gen),
+        torch.randn((n, h, s, e), dtype=torch.bfloat16, device="cuda", generator=gen),
     ]
+    # The fusion matches test_sdpa_fwd's with dropout_p and is_causal bound,
+    # so the shared LRU cache may already hold it.
+    nvf_out, _ = nvfuser_direct_test.exec_nvfuser(
+        fusion_func, [*qkv, 0.0, False], new_fusion_expected=None
+    )
 
-    dropout_vals = [None, 0.0, 0.2]
-    is_causal_vals = [None, True, False]
-    scale_vals = [None, 1 / E**0.5, 1e-3]
-    # TODO: Try to move this to pytest_ops.py. Currently, it does not work since the API between nvFuser and torch differs.
-    for dropout_p, is_causal, scale in itertools.product(
-        dropout_vals, is_causal_vals, scale_vals
-    ):
-        with nvfuser_direct_test.subTest(
-            dropout_p=dropout_p, is_causal=is_causal, scale=scale
-        ):
-            from torch.nn.attention import SDPBackend, sdpa_kernel
-
-            has_dropout = True if dropout_p is not None else False
-            has_causal = True if is_causal is not None else False
-            has_scale = True if scale is not None else False
-            inputs = [*qkv]
-            for param in [dropout_p, is_causal, scale]:
-                if param is not None:
-                    inputs.append(param)
-            nvf_out, _ = nvfuser_direct_test.exec_nvfuser(
-                partial(
-                    fusion_func,
-                    has_dropout=has_dropout,
-                    has_causal=has_causal,
-                    has_scale=has_scale,
-                ),
-                inputs,
-                new_fusion_expected=None,
-            )
-
-            # Torch does not accept NoneType dropout_p, is_causal.
-            dropout_p = 0.0 if dropout_p is None else dropout_p
-            is_causal = False if is_causal is None else is_causal
-
-            with sdpa_kernel(SDPBackend.FLASH_ATTENTION):
-                torch.manual_seed(0)
-                ref_out = F.scaled_dot_product_attention(
-                    *qkv, dropout_p=dropout_p, is_causal=is_causal, scale=scale
-                )
-            torch.testing.assert_close(nvf_out[0], ref_out)
+    with sdpa_kernel(SDPBackend.FLASH_ATTENTION):
+        ref_out = F.scaled_dot_product_attention(*qkv, dropout_p=0.0, is_causal=False)
+    torch.testing.assert_close(nvf_out[0], ref_out)
 
 
 # Memory layout of query, key, value and output tensors.
@@ -235,57 +272,21 @@ def test_sdpa_fwd_bias_mask(nvfuser_direct_test, layout: Layout):
     verify_stride_order(out.stride(), stride_order)
 
 
-def test_sdpa_bwd(nvfuser_direct_test):
-    N, H, L, S, E = 4, 8, 16, 16, 8
-
-    grad_output = torch.randn((N, H, L, E), dtype=torch.bfloat16, device="cuda")
-    q = torch.randn((N, H, L, E), dtype=torch.bfloat16, device="cuda")
-    k = torch.randn((N, H, S, E), dtype=torch.bfloat16, device="cuda")
-    v = torch.randn((N, H, S, E), dtype=torch.bfloat16, device="cuda")
-
-    dropout_vals = [None, 0.0, 0.2]
-    is_causal_vals = [None, True, False]
-    scale_vals = [None, 1 / E**0.5, 1e-3]
+@pytest.mark.parametrize("dropout_p", dropout_vals)
+@pytest.mark.parametrize("is_causal", is_causal_vals)
+@pytest.mark.parametrize("scale", scale_vals)
+def test_sdpa_bwd(nvfuser_direct_test, sdpa_inputs, dropout_p, is_causal, scale):
+    q, k, v, grad_output = sdpa_inputs
 
     def fusion_func(
         fd: FusionDefinition, has_dropout: bool, has_causal: bool, has_scale: bool
     ):
-        grad_output = fd.define_tensor(
-            shape=[-1, -1, -1, -1],
-            contiguity=True,
-            dtype=DataType.BFloat16,
-            is_cpu=False,
-        )
-        q = fd.define_tensor(
-            shape=[-1, -1, -1, -1],
-            contiguity=True,
-            dtype=DataType.BFloat16,
-            is_cpu=False,
-        )
-        k = fd.define_tensor(
-            shape=[-1, -1, -1, -1],
-            contiguity=True,
-            dtype=DataType.BFloat16,
-            is_cpu=False,
-        )
-        v = fd.define_tensor(
-            shape=[-1, -1, -1, -1],
-            contiguity=True,
-            dtype=DataType.BFloat16,
-            is_cpu=False,
-        )
-        output = fd.define_tensor(
-            shape=[-1, -1, -1, -1],
-            contiguity=True,
-            dtype=DataType.BFloat16,
-            is_cpu=False,
-        )
-        logsumexp = fd.define_tensor(
-            shape=[-1, -1, -1],
-            contiguity=True,
-            dtype=DataType.Float,
-            is_cpu=False,
-        )
+        grad_output = _define_tensor(fd)
+        q = _define_tensor(fd)
+        k = _define_tensor(fd)
+        v = _define_tensor(fd)
+        output = _define_tensor(fd)
+        logsumexp = _define_tensor(fd, ndims=3, dtype=DataType.Float)
         philox_seed, philox_offset = define_sdpa_rng_state(fd)
 
         dropout_p, is_causal, scale = None, None, None
@@ -313,120 +314,92 @@ def test_sdpa_bwd(nvfuser_direct_test):
         fd.add_output(grad_key)
         fd.add_output(grad_value)
 
-    for dropout_p, is_causal, scale in itertools.product(
-        dropout_vals, is_causal_vals, scale_vals
-    ):
-        with nvfuser_direct_test.subTest(
-            dropout_p=dropout_p, is_causal=is_causal, scale=scale
-        ):
-            # Torch does not accept NoneType dropout_p, is_causal.
-            at_dropout_p = 0.0 if dropout_p is None else dropout_p
-            at_is_causal = False if is_causal is None else is_causal
-
-            (
-                output,
-                logsumexp,
-                cum_seq_q,
-                cum_seq_k,
-                query_seq_len,
-                key_seq_len,
-                philox_seed,
-                philox_offset,
-                _,
-            ) = torch.ops.aten._scaled_dot_product_flash_attention(
-                q,
-                k,
-                v,
-                at_dropout_p,
-                at_is_causal,
-                return_debug_mask=False,
-                scale=scale,
-            )
-            ref_grad = torch.ops.aten._scaled_dot_product_flash_attention_backward(
-                grad_output,
-                q,
-                k,
-                v,
-                output,
-                logsumexp,
-                cum_seq_q,
-                cum_seq_k,
-                query_seq_len,
-                key_seq_len,
-                at_dropout_p,
-                at_is_causal,
-                philox_seed,
-                philox_offset,
-                scale=scale,
-            )
-
-            has_dropout = True if dropout_p is not None else False
-            has_causal = True if is_causal is not None else False
-            has_scale = True if scale is not None else False
-
-            inputs = [
-                grad_output,
-                q,
-                k,
-                v,
-                output,
-                logsumexp,
-                philox_seed,
-                philox_offset,
-            ]
-            for param in [dropout_p, is_causal, scale]:
-                if param is not None:
-                    inputs.append(param)
-
-            nvf_out, _ = nvfuser_direct_test.exec_nvfuser(
-                partial(
-                    fusion_func,
-                    has_dropout=has_dropout,
-                    has_causal=has_causal,
-                    has_scale=has_scale,
-                ),
-                inputs,
-                new_fusion_expected=None,
-            )
-            torch.testing.assert_close(nvf_out[0], ref_grad[0])
-            torch.testing.assert_close(nvf_out[1], ref_grad[1])
-            torch.testing.assert_close(nvf_out[2], ref_grad[2])
-
-
-def test_sdpa_fwd_bwd(nvfuser_direct_test):
-    N, H, L, S, E = 4, 8, 16, 16, 8
-
-    dropout_vals = [None, 0.0, 0.2]
-    is_causal_vals = [None, True, False]
-    scale_vals = [None, 1 / E**0.5, 1e-3]
+    # Torch does not accept NoneType dropout_p, is_causal.
+    at_dropout_p = 0.0 if dropout_p is None else dropout_p
+    at_is_causal = False if is_causal is None else is_causal
+
+    (
+        output,
+        logsumexp,
+        cum_seq_q,
+        cum_seq_k,
+        query_seq_len,
+        key_seq_len,
+        philox_seed,
+        philox_offset,
+        _,
+    ) = torch.ops.aten._scaled_dot_product_flash_attention(
+        q,
+        k,
+        v,
+        at_dropout_p,
+        at_is_causal,
+        return_debug_mask=False,
+        scale=scale,
+    )
+    ref_grad = torch.ops.aten._scaled_dot_product_flash_attention_backward(
+        grad_output,
+        q,
+        k,
+        v,
+        output,
+        logsumexp,
+        cum_seq_q,
+        cum_seq_k,
+        query_seq_len,
+        key_seq_len,
+        at_dropout_p,
+        at_is_causal,
+        philox_seed,
+        philox_offset,
+        scale=scale,
+    )
 
+    has_dropout = True if dropout_p is not None else False
+    has_causal = True if is_causal is not None else False
+    has_scale = True if scale is not None else False
+
+    inputs = [
+        grad_output,
+        q,
+        k,
+        v,
+        output,
+        logsumexp,
+        philox_seed,
+        philox_offset,
+        *(p for p in (dropout_p, is_causal, scale) if p is not None),
+    ]
+
+    nvf_out, _ = nvfuser_direct_test.exec_nvfuser(
+        partial(
+            fusion_func,
+            has_dropout=has_dropout,
+            has_causal=has_causal,
+            has_scale=has_scale,
+        ),
+        inputs,
+        new_fusion_expected=None,
+    )
+    # dQ, dK and dV have different shapes when L != S, so compare them
+    # flattened and concatenated in a single check.
+    torch.testing.assert_close(
+        torch.cat([t.flatten() for t in nvf_out[:3]]),
+        torch.cat([t.flatten() for t in ref_grad[:3]]),
+    )
+
+
+@pytest.mark.parametrize("dropout_p", dropout_vals)
+@pytest.mark.parametrize("is_causal", is_causal_vals)
+@pytest.mark.parametrize("scale", scale_vals)
+def test_sdpa_fwd_bwd(nvfuser_direct_test, sdpa_inputs, dropout_p, is_causal, scale):
     def fusion_func(
         fd: FusionDefinition, has_dropout: bool, has_causal: bool, has_scale: bool
     ):
-        q = fd.define_tensor(
-            shape=[-1, -1, -1, -1],
-            contiguity=True,
-            dtype=DataType.BFloat16,
-            is_cpu=False,
-        )
-        k = fd.define_tensor(
-            shape=[-1, -1, -1, -1],
-            contiguity=True,
-            dtype=DataType.BFloat16,
-            is_cpu=False,
-        )
-        v = fd.define_tensor(
-            shape=[-1, -1, -1, -1],
-            contiguity=True,
-            dtype=DataType.BFloat16,
-            is_cpu=False,
-        )
-        grad_out = fd.define_tensor(
-            shape=[-1, -1, -1, -1],
-            contiguity=True,
-            dtype=DataType.BFloat16,
-            is_cpu=False,
-        )
+        q = _define_tensor(fd)
+        k = _define_tensor(fd)
+        v = _define_tensor(fd)
+        grad_out = _define_tensor(fd)
 
         dropout_p, is_causal, scale = None, None, None
         if has_dropout:
@@ -458,65 +431,45 @@ def test_sdpa_fwd_bwd(nvfuser_direct_test):
         fd.add_output(grad_key)
         fd.add_output(grad_value)
 
-    for dropout_p, is_causal, scale in itertools.product(
-        dropout_vals, is_causal_vals, scale_vals
-    ):
-        with nvfuser_direct_test.subTest(
-            dropout_p=dropout_p, is_causal=is_causal, scale=scale
-        ):
-            from torch.nn.attention import SDPBackend, sdpa_kernel
+    # `sdpa_inputs` is shared by all parametrizations, so make fresh leaves
+    # for the reference backward to accumulate gradients into.
+    q, k, v = (t.detach().requires_grad_() for t in sdpa_inputs[:3])
+    grad_output = sdpa_inputs[3]
 
-            q = torch.randn(
-                (N, H, L, E),
-                dtype=torch.bfloat16,
-                device="cuda",
-                requires_grad=True,
-            )
-            k = torch.randn(
-                (N, H, S, E),
-                dtype=torch.bfloat16,
-                device="cuda",
-                requires_grad=True,
-            )
-            v = torch.randn(
-                (N, H, S, E),
-                dtype=torch.bfloat16,
-                device="cuda",
-                requires_grad=True,
-            )
-            grad_output = torch.randn((N, H, L, E), dtype=torch.bfloat16, device="cuda")
-
-            has_dropout = True if dropout_p is not None else False
-            has_causal = True if is_causal is not None else False
-            has_scale = True if scale is not None else False
-
-            inputs = [q, k, v, grad_output]
-            for param in [dropout_p, is_causal, scale]:
-                if param is not None:
-                    inputs.append(param)
-
-            # Torch does not accept NoneType dropout_p, is_causal.
-            dropout_p = 0.0 if dropout_p is None else dropout_p
-            is_causal = False if is_causal is None else is_causal
-
-            with sdpa_kernel(SDPBackend.FLASH_ATTENTION):
-                torch.manual_seed(0)
-                ref_out = F.scaled_dot_product_attention(
-                    q, k, v, dropout_p=dropout_p, is_causal=is_causal, scale=scale
-                )
-                ref_out.backward(grad_output)
-
-            nvf_out, _ = nvfuser_direct_test.exec_nvfuser(
-                partial(
-                    fusion_func,
-                    has_dropout=has_dropout,
-                    has_causal=has_causal,
-                    has_scale=has_scale,
-                ),
-                inputs,
-                new_fusion_expected=None,
-            )
-            torch.testing.assert_close(nvf_out[0], ref_out)
-            torch.testing.assert_close(nvf_out[1], q.grad)
-            torch.testing.assert_close(nvf_out[2], k.grad)
-            torch.testing.assert_close(nvf_out[3], v.grad)
+    has_dropout = True if dropout_p is not None else False
+    has_causal = True if is_causal is not None else False
+    has_scale = True if scale is not None else False
+
+    inputs = [
+        q,
+        k,
+        v,
+        grad_output,
+        *(p for p in (dropout_p, is_causal, scale) if p is not None),
+    ]
+
+    # Torch does not accept NoneType dropout_p, is_causal.
+    dropout_p = 0.0 if dropout_p is None else dropout_p
+    is_causal = False if is_causal is None else is_causal
+
+    with sdpa_kernel(SDPBackend.FLASH_ATTENTION):
+        torch.manual_seed(0)
+        ref_out = F.scaled_dot_product_attention(
+            q, k, v, dropout_p=dropout_p, is_causal=is_causal, scale=scale
+        )
+        ref_out.backward(grad_output)
+
+    nvf_out, _ = nvfuser_direct_test.exec_nvfuser(
+        partial(
+            fusion_func,
+            has_dropout=has_dropout,
+            has_causal=has_causal,
+            has_scale=has_scale,
+        ),
+        inputs,
+        new_fusion_expected=None,
+    )
+    torch.testing.assert_close(
+        torch.cat([t.flatten() for t in nvf_out[:4]]),
+        torch.cat([t.flatten() for t in (ref_out, q.grad, k.grad, v.grad)]),
+    )
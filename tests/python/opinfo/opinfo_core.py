@@ -84,7 +84,7 @@ class SampleInput:
         return SampleInput(*args, *self.kwargs.values())
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class OpInfo:
     """Operator information and helper functions for acquiring it."""
 
@@ -83,18 +83,16 @@ if JAX_AVAILABLE:
 
 eps = 1e-2
 
-opinfos = []
+# torch._grouped_mm and torch._scaled_grouped_mm is not available prior to PyTorch 2.8.0
+_TORCH_GE_2_8 = LooseVersion(torch.__version__) >= LooseVersion("2.8.0")
 
 """ Start Fusion Input Operations """
-fusion_input_ops = []
-
 define_tensor_opinfo = OpInfo(
     lambda fd: fd.define_tensor,
     "define_tensor",
     error_input_generator=define_tensor_error_generator,
     fd_error_input_fn=tensor_input_fd_fn,
 )
-fusion_input_ops.append(define_tensor_opinfo)
 
 # NOTE: "define_vector" only supports vectors of integers that represent
 # tensor shapes and is not a general interface for defining vectors of
@@ -108,13 +106,12 @@ define_vector_constant_opinfo = OpInfo(
     # These python lists are directly indexable, so `define_vector_constant` is not needed.
     supports_direct_bindings=False,
 )
-fusion_input_ops.append(define_vector_constant_opinfo)
+
+fusion_input_ops = (define_tensor_opinfo, define_vector_constant_opinfo)
 
 """ End Fusion Input Operations """
 
 """ Start Unary-Float Operations """
-unary_ops = []
-
 abs_opinfo = OpInfo(
     lambda fd: fd.ops.abs,
     "abs",
@@ -122,7 +119,6 @@ abs_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.abs),
     is_clonable=True,
 )
-unary_ops.append(abs_opinfo)
 
 acos_opinfo = OpInfo(
     lambda fd: fd.ops.acos,
@@ -132,7 +128,6 @@ acos_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.acos),
     is_clonable=True,
 )
-unary_ops.append(acos_opinfo)
 
 acosh_opinfo = OpInfo(
     lambda fd: fd.ops.acosh,
@@ -142,7 +137,6 @@ acosh_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.acosh),
     is_clonable=True,
 )
-unary_ops.append(acosh_opinfo)
 
 asin_opinfo = OpInfo(
     lambda fd: fd.ops.asin,
@@ -152,7 +146,6 @@ asin_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.asin),
     is_clonable=True,
 )
-unary_ops.append(asin_opinfo)
 
 asinh_opinfo = OpInfo(
     lambda fd: fd.ops.asinh,
@@ -161,7 +154,6 @@ asinh_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.asinh),
     is_clonable=True,
 )
-unary_ops.append(asinh_opinfo)
 
 atan_opinfo = OpInfo(
     lambda fd: fd.ops.atan,
@@ -170,7 +162,6 @@ atan_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.atan),
     is_clonable=True,
 )
-unary_ops.append(atan_opinfo)
 
 atanh_opinfo = OpInfo(
     lambda fd: fd.ops.atanh,
@@ -180,7 +171,6 @@ atanh_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.atanh),
     is_clonable=True,
 )
-unary_ops.append(atanh_opinfo)
 
 bitwise_not_opinfo = OpInfo(
     lambda fd: fd.ops.bitwise_not,
@@ -190,7 +180,6 @@ bitwise_not_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.bitwise_not),
     is_clonable=True,
 )
-unary_ops.append(bitwise_not_opinfo)
 
 # TODO add nvfuser exception for int dtypes
 ceil_opinfo = OpInfo(
@@ -201,7 +190,6 @@ ceil_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.ceil),
     is_clonable=True,
 )
-unary_ops.append(ceil_opinfo)
 
 cos_opinfo = OpInfo(
     lambda fd: fd.ops.cos,
@@ -210,7 +198,6 @@ cos_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.cos),
     is_clonable=True,
 )
-unary_ops.append(cos_opinfo)
 
 cosh_opinfo = OpInfo(
     lambda fd: fd.ops.cosh,
@@ -219,7 +206,6 @@ cosh_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.cosh),
     is_clonable=True,
 )
-unary_ops.append(cosh_opinfo)
 
 erf_opinfo = OpInfo(
     lambda fd: fd.ops.erf,
@@ -229,7 +215,6 @@ erf_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.erf),
     is_clonable=True,
 )
-unary_ops.append(erf_opinfo)
 
 erfc_opinfo = OpInfo(
     lambda fd: fd.ops.erfc,
@@ -239,7 +224,6 @@ erfc_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.erfc),
     is_clonable=True,
 )
-unary_ops.append(erfc_opinfo)
 
 erfcinv_opinfo = OpInfo(
     lambda fd: fd.ops.erfcinv,
@@ -253,7 +237,6 @@ erfcinv_opinfo = OpInfo(
     reference=_elementwise_unary_torch(lambda x: torch.erfinv(1 - x)),
     is_clonable=True,
 )
-unary_ops.append(erfcinv_opinfo)
 
 erfinv_opinfo = OpInfo(
     lambda fd: fd.ops.erfinv,
@@ -264,7 +247,6 @@ erfinv_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.erfinv),
     is_clonable=True,
 )
-unary_ops.append(erfinv_opinfo)
 
 exp_opinfo = OpInfo(
     lambda fd: fd.ops.exp,
@@ -273,7 +255,6 @@ exp_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.exp),
     is_clonable=True,
 )
-unary_ops.append(exp_opinfo)
 
 exp2_opinfo = OpInfo(
     lambda fd: fd.ops.exp2,
@@ -283,7 +264,6 @@ exp2_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.exp2),
     is_clonable=True,
 )
-unary_ops.append(exp2_opinfo)
 
 expm1_opinfo = OpInfo(
     lambda fd: fd.ops.expm1,
@@ -293,7 +273,6 @@ expm1_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.expm1),
     is_clonable=True,
 )
-unary_ops.append(expm1_opinfo)
 
 # TODO add nvfuser exception for int dtypes
 floor_opinfo = OpInfo(
@@ -304,7 +283,6 @@ floor_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.floor),
     is_clonable=True,
 )
-unary_ops.append(floor_opinfo)
 
 frac_opinfo = OpInfo(
     lambda fd: fd.ops.frac,
@@ -314,7 +292,6 @@ frac_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.frac),
     is_clonable=True,
 )
-unary_ops.append(frac_opinfo)
 
 isfinite_opinfo = OpInfo(
     lambda fd: fd.ops.isfinite,
@@ -323,7 +300,6 @@ isfinite_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.isfinite),
     is_clonable=True,
 )
-unary_ops.append(isfinite_opinfo)
 
 isinf_opinfo = OpInfo(
     lambda fd: fd.ops.isinf,
@@ -332,7 +308,6 @@ isinf_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.isinf),
     is_clonable=True,
 )
-unary_ops.append(isinf_opinfo)
 
 isnan_opinfo = OpInfo(
     lambda fd: fd.ops.isnan,
@@ -341,7 +316,6 @@ isnan_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.isnan),
     is_clonable=True,
 )
-unary_ops.append(isnan_opinfo)
 
 # NOTE half-precision floating types are not automatically promoted to fp32
 isneginf_opinfo = OpInfo(
@@ -352,7 +326,6 @@ isneginf_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.isneginf),
     is_clonable=True,
 )
-unary_ops.append(isneginf_opinfo)
 
 # NOTE half-precision floating types are not automatically promoted to fp32
 isposinf_opinfo = OpInfo(
@@ -363,7 +336,6 @@ isposinf_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.isposinf),
     is_clonable=True,
 )
-unary_ops.append(isposinf_opinfo)
 
 isreal_opinfo = OpInfo(
     lambda fd: fd.ops.isreal,
@@ -372,7 +344,6 @@ isreal_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.isreal),
     is_clonable=True,
 )
-unary_ops.append(isreal_opinfo)
 
 lgamma_opinfo = OpInfo(
     lambda fd: fd.ops.lgamma,
@@ -383,7 +354,6 @@ lgamma_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.lgamma),
     is_clonable=True,
 )
-unary_ops.append(lgamma_opinfo)
 
 log_opinfo = OpInfo(
     lambda fd: fd.ops.log,
@@ -393,7 +363,6 @@ log_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.log),
     is_clonable=True,
 )
-unary_ops.append(log_opinfo)
 
 log10_opinfo = OpInfo(
     lambda fd: fd.ops.log10,
@@ -404,7 +373,6 @@ log10_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.log10),
     is_clonable=True,
 )
-unary_ops.append(log10_opinfo)
 
 log1p_opinfo = OpInfo(
     lambda fd: fd.ops.log1p,
@@ -415,7 +383,6 @@ log1p_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.log1p),
     is_clonable=True,
 )
-unary_ops.append(log1p_opinfo)
 
 log2_opinfo = OpInfo(
     lambda fd: fd.ops.log2,
@@ -425,7 +392,6 @@ log2_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.log2),
     is_clonable=True,
 )
-unary_ops.append(log2_opinfo)
 
 neg_opinfo = OpInfo(
     lambda fd: fd.ops.neg,
@@ -434,7 +400,6 @@ neg_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.neg),
     is_clonable=True,
 )
-unary_ops.append(neg_opinfo)
 
 reciprocal_opinfo = OpInfo(
     lambda fd: fd.ops.reciprocal,
@@ -449,7 +414,6 @@ reciprocal_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.reciprocal),
     is_clonable=True,
 )
-unary_ops.append(reciprocal_opinfo)
 
 # TODO add nvfuser exception for int dtypes
 round_opinfo = OpInfo(
@@ -460,7 +424,6 @@ round_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.round),
     is_clonable=True,
 )
-unary_ops.append(round_opinfo)
 
 rsqrt_opinfo = OpInfo(
     lambda fd: fd.ops.rsqrt,
@@ -475,7 +438,6 @@ rsqrt_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.rsqrt),
     is_clonable=True,
 )
-unary_ops.append(rsqrt_opinfo)
 
 sigmoid_opinfo = OpInfo(
     lambda fd: fd.ops.sigmoid,
@@ -484,7 +446,6 @@ sigmoid_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.sigmoid),
     is_clonable=True,
 )
-unary_ops.append(sigmoid_opinfo)
 
 signbit_opinfo = OpInfo(
     lambda fd: fd.ops.signbit,
@@ -494,7 +455,6 @@ signbit_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.signbit),
     is_clonable=True,
 )
-unary_ops.append(signbit_opinfo)
 
 sin_opinfo = OpInfo(
     lambda fd: fd.ops.sin,
@@ -503,7 +463,6 @@ sin_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.sin),
     is_clonable=True,
 )
-unary_ops.append(sin_opinfo)
 
 sinh_opinfo = OpInfo(
     lambda fd: fd.ops.sinh,
@@ -512,7 +471,6 @@ sinh_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.sinh),
     is_clonable=True,
 )
-unary_ops.append(sinh_opinfo)
 
 sqrt_opinfo = OpInfo(
     lambda fd: fd.ops.sqrt,
@@ -522,7 +480,6 @@ sqrt_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.sqrt),
     is_clonable=True,
 )
-unary_ops.append(sqrt_opinfo)
 
 tan_opinfo = OpInfo(
     lambda fd: fd.ops.tan,
@@ -532,7 +489,6 @@ tan_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.tan),
     is_clonable=True,
 )
-unary_ops.append(tan_opinfo)
 
 tanh_opinfo = OpInfo(
     lambda fd: fd.ops.tanh,
@@ -542,7 +498,6 @@ tanh_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.tanh),
     is_clonable=True,
 )
-unary_ops.append(tanh_opinfo)
 
 # TODO add nvfuser exception for int dtypes
 trunc_opinfo = OpInfo(
@@ -553,7 +508,52 @@ trunc_opinfo = OpInfo(
     reference=_elementwise_unary_torch(torch.trunc),
     is_clonable=True,
 )
-unary_ops.append(trunc_opinfo)
+
+unary_ops = (
+    abs_opinfo,
+    acos_opinfo,
+    acosh_opinfo,
+    asin_opinfo,
+    asinh_opinfo,
+    atan_opinfo,
+    atanh_opinfo,
+    bitwise_not_opinfo,
+    ceil_opinfo,
+    cos_opinfo,
+    cosh_opinfo,
+    erf_opinfo,
+    erfc_opinfo,
+    erfcinv_opinfo,
+    erfinv_opinfo,
+    exp_opinfo,
+    exp2_opinfo,
+    expm1_opinfo,
+    floor_opinfo,
+    frac_opinfo,
+    isfinite_opinfo,
+    isinf_opinfo,
+    isnan_opinfo,
+    isneginf_opinfo,
+    isposinf_opinfo,
+    isreal_opinfo,
+    lgamma_opinfo,
+    log_opinfo,
+    log10_opinfo,
+    log1p_opinfo,
+    log2_opinfo,
+    neg_opinfo,
+    reciprocal_opinfo,
+    round_opinfo,
+    rsqrt_opinfo,
+    sigmoid_opinfo,
+    signbit_opinfo,
+    sin_opinfo,
+    sinh_opinfo,
+    sqrt_opinfo,
+    tan_opinfo,
+    tanh_opinfo,
+    trunc_opinfo,
+)
 
 """ End Unary-Float Operations """
 
@@ -573,8 +573,6 @@ unary_ops.append(trunc_opinfo)
 # TODO logical_right_shift - domain of shift parameter is non-zero; Otherwise the result is undefined.
 
 
-binary_ops = []
-
 add_opinfo = OpInfo(
     lambda fd: fd.ops.add,
     "add",
@@ -584,7 +582,6 @@ add_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.add),
     is_clonable=True,
 )
-binary_ops.append(add_opinfo)
 
 # TODO complex dtypes are unsupported, but we fail when compiling kernel
 atan2_opinfo = OpInfo(
@@ -595,7 +592,6 @@ atan2_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.atan2),
     is_clonable=True,
 )
-binary_ops.append(atan2_opinfo)
 
 bitwise_and_opinfo = OpInfo(
     lambda fd: fd.ops.bitwise_and,
@@ -605,7 +601,6 @@ bitwise_and_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.bitwise_and),
     is_clonable=True,
 )
-binary_ops.append(bitwise_and_opinfo)
 
 bitwise_left_shift_opinfo = OpInfo(
     lambda fd: fd.ops.bitwise_left_shift,
@@ -615,7 +610,6 @@ bitwise_left_shift_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.bitwise_left_shift),
     is_clonable=True,
 )
-binary_ops.append(bitwise_left_shift_opinfo)
 
 bitwise_or_opinfo = OpInfo(
     lambda fd: fd.ops.bitwise_or,
@@ -625,7 +619,6 @@ bitwise_or_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.bitwise_or),
     is_clonable=True,
 )
-binary_ops.append(bitwise_or_opinfo)
 
 bitwise_right_shift_opinfo = OpInfo(
     lambda fd: fd.ops.bitwise_right_shift,
@@ -635,7 +628,6 @@ bitwise_right_shift_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.bitwise_right_shift),
     is_clonable=True,
 )
-binary_ops.append(bitwise_right_shift_opinfo)
 
 bitwise_xor_opinfo = OpInfo(
     lambda fd: fd.ops.bitwise_xor,
@@ -645,7 +637,6 @@ bitwise_xor_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.bitwise_xor),
     is_clonable=True,
 )
-binary_ops.append(bitwise_xor_opinfo)
 
 div_opinfo = OpInfo(
     lambda fd: fd.ops.div,
@@ -655,7 +646,6 @@ div_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.div),
     is_clonable=True,
 )
-binary_ops.append(div_opinfo)
 
 eq_opinfo = OpInfo(
     lambda fd: fd.ops.eq,
@@ -664,7 +654,6 @@ eq_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.eq),
     is_clonable=True,
 )
-binary_ops.append(eq_opinfo)
 
 fmod_opinfo = OpInfo(
     lambda fd: fd.ops.fmod,
@@ -674,7 +663,6 @@ fmod_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.fmod),
     is_clonable=True,
 )
-binary_ops.append(fmod_opinfo)
 
 ge_opinfo = OpInfo(
     lambda fd: fd.ops.ge,
@@ -684,7 +672,6 @@ ge_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.ge),
     is_clonable=True,
 )
-binary_ops.append(ge_opinfo)
 
 gt_opinfo = OpInfo(
     lambda fd: fd.ops.gt,
@@ -694,7 +681,6 @@ gt_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.gt),
     is_clonable=True,
 )
-binary_ops.append(gt_opinfo)
 
 le_opinfo = OpInfo(
     lambda fd: fd.ops.le,
@@ -704,7 +690,6 @@ le_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.le),
     is_clonable=True,
 )
-binary_ops.append(le_opinfo)
 
 # TODO domain of shift parameter greater than zero; Otherwise the result is undefined.
 logical_right_shift_opinfo = OpInfo(
@@ -723,7 +708,6 @@ logical_right_shift_opinfo = OpInfo(
     reference_type=ReferenceType.Jax,
     is_clonable=True,
 )
-binary_ops.append(logical_right_shift_opinfo)
 
 lt_opinfo = OpInfo(
     lambda fd: fd.ops.lt,
@@ -733,7 +717,6 @@ lt_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.lt),
     is_clonable=True,
 )
-binary_ops.append(lt_opinfo)
 
 minimum_opinfo = OpInfo(
     lambda fd: fd.ops.minimum,
@@ -743,7 +726,6 @@ minimum_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.minimum),
     is_clonable=True,
 )
-binary_ops.append(minimum_opinfo)
 
 maximum_opinfo = OpInfo(
     lambda fd: fd.ops.maximum,
@@ -753,7 +735,6 @@ maximum_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.maximum),
     is_clonable=True,
 )
-binary_ops.append(maximum_opinfo)
 
 mod_opinfo = OpInfo(
     lambda fd: fd.ops.mod,
@@ -768,7 +749,6 @@ mod_opinfo = OpInfo(
     reference=lambda a, b: a - b * torch.trunc(a / b).to(a.dtype),
     is_clonable=True,
 )
-binary_ops.append(mod_opinfo)
 
 mul_opinfo = OpInfo(
     lambda fd: fd.ops.mul,
@@ -779,7 +759,6 @@ mul_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.mul),
     is_clonable=True,
 )
-binary_ops.append(mul_opinfo)
 
 ne_opinfo = OpInfo(
     lambda fd: fd.ops.ne,
@@ -788,7 +767,6 @@ ne_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.ne),
     is_clonable=True,
 )
-binary_ops.append(ne_opinfo)
 
 nextafter_opinfo = OpInfo(
     lambda fd: fd.ops.nextafter,
@@ -798,7 +776,6 @@ nextafter_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.nextafter),
     is_clonable=True,
 )
-binary_ops.append(nextafter_opinfo)
 
 # complex dtypes --- AssertionError: Tensor-likes are not close!
 pow_opinfo = OpInfo(
@@ -809,7 +786,6 @@ pow_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.pow),
     is_clonable=True,
 )
-binary_ops.append(pow_opinfo)
 
 remainder_opinfo = OpInfo(
     lambda fd: fd.ops.remainder,
@@ -823,7 +799,6 @@ remainder_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.remainder),
     is_clonable=True,
 )
-binary_ops.append(remainder_opinfo)
 
 sub_opinfo = OpInfo(
     lambda fd: fd.ops.sub,
@@ -834,7 +809,6 @@ sub_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.sub),
     is_clonable=True,
 )
-binary_ops.append(sub_opinfo)
 
 truediv_opinfo = OpInfo(
     lambda fd: fd.ops.truediv,
@@ -843,7 +817,6 @@ truediv_opinfo = OpInfo(
     reference=_elementwise_binary_torch(torch.true_divide),
     is_clonable=True,
 )
-binary_ops.append(truediv_opinfo)
 
 # For int dtypes, nvfuser div op has the semantics of c++ / operator, so its reference is trunc_divide.
 trunc_div_opinfo = OpInfo(
@@ -859,27 +832,52 @@ trunc_div_opinfo = OpInfo(
     reference=_elementwise_binary_torch(partial(torch.div, rounding_mode="trunc")),
     is_clonable=True,
 )
-binary_ops.append(trunc_div_opinfo)
+
+binary_ops = (
+    add_opinfo,
+    atan2_opinfo,
+    bitwise_and_opinfo,
+    bitwise_left_shift_opinfo,
+    bitwise_or_opinfo,
+    bitwise_right_shift_opinfo,
+    bitwise_xor_opinfo,
+    div_opinfo,
+    eq_opinfo,
+    fmod_opinfo,
+    ge_opinfo,
+    gt_opinfo,
+    le_opinfo,
+    logical_right_shift_opinfo,
+    lt_opinfo,
+    minimum_opinfo,
+    maximum_opinfo,
+    mod_opinfo,
+    mul_opinfo,
+    ne_opinfo,
+    nextafter_opinfo,
+    pow_opinfo,
+    remainder_opinfo,
+    sub_opinfo,
+    truediv_opinfo,
+    trunc_div_opinfo,
+)
 
 """ End Binary Operations """
 
 """ Start Ternary Operations """
 
-ternary_ops = []
-
 where_opinfo = OpInfo(
     lambda fd: fd.ops.where,
     "where",
     error_input_generator=where_error_generator,
 )
-ternary_ops.append(where_opinfo)
+
+ternary_ops = (where_opinfo,)
 
 """ End Ternary Operations """
 
 """ Start Dynamic Shape Enabling Operations """
 
-dynamic_shapes_ops = []
-
 # TODO: Add correctness testing as noted below
 tensor_shape_opinfo = OpInfo(
     lambda fd: fd.ops.shape,
@@ -890,7 +888,6 @@ tensor_shape_opinfo = OpInfo(
     # Tensor inputs will check possible errors
     error_input_generator=None,
 )
-dynamic_shapes_ops.append(tensor_shape_opinfo)
 
 # TODO: Add correctness testing as noted below
 tensor_size_opinfo = OpInfo(
@@ -902,7 +899,6 @@ tensor_size_opinfo = OpInfo(
     fd_correctness_fn=None,
     fd_error_input_fn=tensor_api_test_fd_fn,
 )
-dynamic_shapes_ops.append(tensor_size_opinfo)
 
 # TODO: Add correctness testing as noted below
 vector_at_opinfo = OpInfo(
@@ -917,14 +913,13 @@ vector_at_opinfo = OpInfo(
     # These python lists are directly indexable, so `at` is not needed.
     supports_direct_bindings=False,
 )
-dynamic_shapes_ops.append(vector_at_opinfo)
+
+dynamic_shapes_ops = (tensor_shape_opinfo, tensor_size_opinfo, vector_at_opinfo)
 
 
 """ End Dynamic Shape Enabling Operations """
 
 """ Start Normalization Operations """
-normalization_ops = []
-
 var_mean_opinfo = OpInfo(
     lambda fd: fd.ops.var_mean,
     "var_mean",
@@ -934,14 +929,13 @@ var_mean_opinfo = OpInfo(
     reference=torch.var_mean,
     symbolic_parameter_list=(ArgumentType.Symbolic, ArgumentType.Constant),
 )
-normalization_ops.append(var_mean_opinfo)
+
+normalization_ops = (var_mean_opinfo,)
 
 """ End Normalization Operations """
 
 """ Start Shape Operations """
 
-shape_ops = []
-
 cat_opinfo = OpInfo(
     lambda fd: fd.ops.cat,
     "cat",
@@ -950,7 +944,6 @@ cat_opinfo = OpInfo(
     reference=torch.cat,
     symbolic_parameter_list=(ArgumentType.Symbolic, ArgumentType.Constant),
 )
-shape_ops.append(cat_opinfo)
 
 broadcast_opinfo = OpInfo(
     lambda fd: fd.ops.broadcast,
@@ -958,7 +951,6 @@ broadcast_opinfo = OpInfo(
     error_input_generator=broadcast_error_generator,
     symbolic_parameter_list=(ArgumentType.Symbolic, ArgumentType.Constant),
 )
-shape_ops.append(broadcast_opinfo)
 
 # NOTE: The constant version of broadcast_in_dim opinfo tests the "shape"
 # argument when a List of Constant Ints is used as an input.
@@ -979,7 +971,6 @@ broadcast_in_dim_constant_opinfo = OpInfo(
         ArgumentType.Constant,
     ),
 )
-shape_ops.append(broadcast_in_dim_constant_opinfo)
 
 
 # NOTE: The symbolic version of broadcast_in_dim opinfo tests the "shape"
@@ -1005,21 +996,18 @@ broadcast_in_dim_symbolic_opinfo = OpInfo(
         ArgumentType.Constant,
     ),
 )
-shape_ops.append(broadcast_in_dim_symbolic_opinfo)
 
 
 # translate between nvfuser and pytorch argument order for scatter
-def scatter_wrapper(
-    fn: callable, input: torch.Tensor, index: torch.Tensor, src: torch.Tensor, dim: int
-):
-    return fn(input, dim, index, src)
+def scatter_ref(input: torch.Tensor, index: torch.Tensor, src: torch.Tensor, dim: int):
+    return torch.scatter(input, dim, index, src)
 
 
 scatter_opinfo = OpInfo(
     lambda fd: fd.ops.scatter,
     "scatter",
     sample_input_generator=scatter_generator,
-    reference=partial(scatter_wrapper, torch.scatter),
+    reference=scatter_ref,
     symbolic_parameter_list=(
         ArgumentType.Symbolic,
         ArgumentType.Symbolic,
@@ -1027,12 +1015,15 @@ scatter_opinfo = OpInfo(
         ArgumentType.Constant,
     ),
 )
-shape_ops.append(scatter_opinfo)
 
 
-# translate between nvfuser and pytorch argument order for gather, take_along_dim, and index_select
-def gather_wrapper(fn: callable, input: torch.Tensor, index: torch.Tensor, dim: int):
-    return fn(input, dim, index)
+# translate between nvfuser and pytorch argument order for gather and index_select
+def gather_ref(input: torch.Tensor, index: torch.Tensor, dim: int):
+    return torch.gather(input, dim, index)
+
+
+def index_select_ref(input: torch.Tensor, index: torch.Tensor, dim: int):
+    return torch.index_select(input, dim, index)
 
 
 gather_opinfo = OpInfo(
@@ -1040,28 +1031,26 @@ gather_opinfo = OpInfo(
     "gather",
     sample_input_generator=gather_generator,
     error_input_generator=take_along_axis_error_generator,
-    reference=partial(gather_wrapper, torch.gather),
+    reference=gather_ref,
     symbolic_parameter_list=(
         ArgumentType.Symbolic,
         ArgumentType.Symbolic,
         ArgumentType.Constant,
     ),
 )
-shape_ops.append(gather_opinfo)
 
 index_select_opinfo = OpInfo(
     lambda fd: fd.ops.index_select,
     "index_select",
     sample_input_generator=index_select_generator,
     error_input_generator=index_select_error_generator,
-    reference=partial(gather_wrapper, torch.index_select),
+    reference=index_select_ref,
     symbolic_parameter_list=(
         ArgumentType.Symbolic,
         ArgumentType.Symbolic,
         ArgumentType.Constant,
     ),
 )
-shape_ops.append(index_select_opinfo)
 
 
 # we needed a reference because argsort requires kwargs.
@@ -1083,7 +1072,6 @@ argsort_opinfo = OpInfo(
         ArgumentType.Constant,
     ),
 )
-shape_ops.append(argsort_opinfo)
 
 
 topk_opinfo = OpInfo(
@@ -1101,7 +1089,6 @@ topk_opinfo = OpInfo(
         ArgumentType.Constant,  # sorted
     ),
 )
-shape_ops.append(topk_opinfo)
 
 
 def index_put_accumulate_ref(
@@ -1130,7 +1117,6 @@ index_put_accumulate_opinfo = OpInfo(
     # index_put_accumulate is not used in Thunder, so skip in direct bindings for now.
     supports_direct_bindings=False,
 )
-shape_ops.append(index_put_accumulate_opinfo)
 
 # NvFuser's API is significantly different than JAX.
 # TODO: Change python frontend api to match JAX using a cpp wrapper function.
@@ -1144,7 +1130,6 @@ pad_opinfo = OpInfo(
         ArgumentType.Symbolic,
     ),
 )
-shape_ops.append(pad_opinfo)
 
 
 permute_opinfo = OpInfo(
@@ -1155,7 +1140,6 @@ permute_opinfo = OpInfo(
     reference=torch.permute,
     symbolic_parameter_list=(ArgumentType.Symbolic, ArgumentType.Constant),
 )
-shape_ops.append(permute_opinfo)
 
 
 reshape_constant_opinfo = OpInfo(
@@ -1169,7 +1153,6 @@ reshape_constant_opinfo = OpInfo(
         ArgumentType.Constant,
     ),
 )
-shape_ops.append(reshape_constant_opinfo)
 
 
 def reshape_sym_fn(fd, input_tensor, output_shaped_tensor):
@@ -1191,7 +1174,6 @@ reshape_symbolic_opinfo = OpInfo(
         ArgumentType.Symbolic,
     ),
 )
-shape_ops.append(reshape_symbolic_opinfo)
 
 
 slice_opinfo = OpInfo(
@@ -1202,7 +1184,6 @@ slice_opinfo = OpInfo(
     reference=jax.lax.slice if JAX_AVAILABLE else None,
     reference_type=ReferenceType.Jax,
 )
-shape_ops.append(slice_opinfo)
 
 squeeze_opinfo = OpInfo(
     lambda fd: fd.ops.squeeze,
@@ -1215,7 +1196,6 @@ squeeze_opinfo = OpInfo(
         ArgumentType.Constant,
     ),
 )
-shape_ops.append(squeeze_opinfo)
 
 take_along_axis_opinfo = OpInfo(
     lambda fd: fd.ops.take_along_axis,
@@ -1230,13 +1210,30 @@ take_along_axis_opinfo = OpInfo(
     ),
     supports_direct_bindings=True,
 )
-shape_ops.append(take_along_axis_opinfo)
+
+shape_ops = (
+    cat_opinfo,
+    broadcast_opinfo,
+    broadcast_in_dim_constant_opinfo,
+    broadcast_in_dim_symbolic_opinfo,
+    scatter_opinfo,
+    gather_opinfo,
+    index_select_opinfo,
+    argsort_opinfo,
+    topk_opinfo,
+    index_put_accumulate_opinfo,
+    pad_opinfo,
+    permute_opinfo,
+    reshape_constant_opinfo,
+    reshape_symbolic_opinfo,
+    slice_opinfo,
+    squeeze_opinfo,
+    take_along_axis_opinfo,
+)
 
 """ End Shape Operations """
 
 """ Start Tensor Creation """
-tensor_creation_ops = []
-
 full_opinfo = OpInfo(
     lambda fd: fd.ops.full,
     "full",
@@ -1247,7 +1244,6 @@ full_opinfo = OpInfo(
         ArgumentType.Constant,
     ),
 )
-tensor_creation_ops.append(full_opinfo)
 
 # Dynamic scalars are not checked at runtime, so we treat length, start, step as constants.
 iota_opinfo = OpInfo(
@@ -1262,12 +1258,11 @@ iota_opinfo = OpInfo(
         ArgumentType.Constant,
     ),
 )
-tensor_creation_ops.append(iota_opinfo)
 
 # NOTE: normal's python API does not produce value based errors given most parameters are
 # symbolic as Scalar or Vector parameters.  The dtype parameter is checked to make sure the
 # user does not ask for non-floating point random numbers.
-uniform_opinfo = OpInfo(
+normal_opinfo = OpInfo(
     lambda fd: fd.ops.normal,
     "normal",
     dtypes=(bool_int_dtypes + complex_dtypes),
@@ -1279,7 +1274,6 @@ uniform_opinfo = OpInfo(
     ),
     supports_direct_bindings=True,
 )
-tensor_creation_ops.append(uniform_opinfo)
 
 # NOTE: uniform's python API does not produce value based errors given most parameters are
 # symbolic as Scalar or Vector parameters.  The dtype parameter is checked to make sure the
@@ -1296,26 +1290,30 @@ uniform_opinfo = OpInfo(
     ),
     supports_direct_bindings=True,
 )
-tensor_creation_ops.append(uniform_opinfo)
 
-matmul_ops = []
+tensor_creation_ops = (full_opinfo, iota_opinfo, normal_opinfo, uniform_opinfo)
+
+# Query the device once; the matmul and linear opinfos below are gated on it.
+_DEVICE_MAJOR = (
+    torch.cuda.get_device_properties(torch.cuda.current_device()).major
+    if torch.cuda.is_available()
+    else 0
+)
 
 matmul_opinfo = OpInfo(
     lambda fd: fd.ops.matmul,
     "matmul",
     # bf16 needs Ampere or newer.
     dtypes=(
-        (torch.float16, torch.bfloat16)
-        if torch.cuda.get_device_properties(torch.cuda.current_device()).major >= 8
-        else (torch.float16,)
+        (torch.float16, torch.bfloat16) if _DEVICE_MAJOR >= 8 else (torch.float16,)
     ),
     sample_input_generator=matmul_input_generator,
     reference=torch.matmul,
 )
-matmul_ops.append(matmul_opinfo)
 
-# torch._grouped_mm and torch._scaled_grouped_mm is not available prior to PyTorch 2.8.0
-if LooseVersion(torch.__version__) >= LooseVersion("2.8.0"):
+matmul_ops = (matmul_opinfo,)
+
+if _TORCH_GE_2_8:
     grouped_mm_opinfo = OpInfo(
         lambda fd: fd.ops.grouped_mm,
         "grouped_mm",
@@ -1396,31 +1394,25 @@ if LooseVersion(torch.__version__) >= LooseVersion("2.8.0"):
     )
 
     # only hopper is supported with torch._grouped_mm at this point.
-    if torch.cuda.get_device_properties(torch.cuda.current_device()).major == 9:
-        matmul_ops.append(grouped_mm_opinfo)
-        matmul_ops.append(scaled_grouped_mm_opinfo)
-
-    if torch.cuda.get_device_properties(torch.cuda.current_device()).major >= 10:
-        matmul_ops.append(scaled_mm_opinfo)
+    if _DEVICE_MAJOR == 9:
+        matmul_ops += (grouped_mm_opinfo, scaled_grouped_mm_opinfo)
 
-linear_ops = []
+    if _DEVICE_MAJOR >= 10:
+        matmul_ops += (scaled_mm_opinfo,)
 
 linear_opinfo = OpInfo(
     lambda fd: fd.ops.linear,
     "linear",
     # bf16 needs Ampere or newer.
     dtypes=(
-        (torch.float16, torch.bfloat16)
-        if torch.cuda.get_device_properties(torch.cuda.current_device()).major >= 8
-        else (torch.float16,)
+        (torch.float16, torch.bfloat16) if _DEVICE_MAJOR >= 8 else (torch.float16,)
     ),
     sample_input_generator=linear_input_generator,
     error_input_generator=linear_error_generator,
     reference=torch.nn.functional.linear,
 )
-linear_ops.append(linear_opinfo)
 
-tv_val_ops = []
+linear_ops = (linear_opinfo,)
 
 triu_opinfo = OpInfo(
     lambda fd: fd.ops.triu,
@@ -1442,21 +1434,22 @@ cumsum_opinfo = OpInfo(
     symbolic_parameter_list=[ArgumentType.Symbolic, ArgumentType.Constant],
 )
 
-tv_val_ops.append(cumsum_opinfo)
 
-tv_val_ops.append(triu_opinfo)
+tv_val_ops = (cumsum_opinfo, triu_opinfo)
 
 """ End Tensor Creation """
 
-# Puts all opinfos into the "opinfos" list
-opinfos.extend(unary_ops)
-opinfos.extend(binary_ops)
-opinfos.extend(ternary_ops)
-opinfos.extend(fusion_input_ops)
-opinfos.extend(dynamic_shapes_ops)
-opinfos.extend(normalization_ops)
-opinfos.extend(shape_ops)
-opinfos.extend(tensor_creation_ops)
-opinfos.extend(matmul_ops)
-opinfos.extend(linear_ops)
-opinfos.extend(tv_val_ops)
+# Puts all opinfos into the "opinfos" tuple
+opinfos = (
+    unary_ops
+    + binary_ops
+    + ternary_ops
+    + fusion_input_ops
+    + dynamic_shapes_ops
+    + normalization_ops
+    + shape_ops
+    + tensor_creation_ops
+    + matmul_ops
+    + linear_ops
+    + tv_val_ops
+)
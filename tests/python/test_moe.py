@@ -3,9 +3,9 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 import math
-from contextlib import contextmanager
 from dataclasses import dataclass
 
+import pytest
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
@@ -20,14 +20,28 @@ class Config:
     intermediate_size: int = 8192
     num_routed_experts: int = 128
     num_shared_experts: int = 1
+    dtype: torch.dtype = torch.bfloat16
+    device: str = "cuda"
 
 
 class SwiGLU(nn.Module):
-    def __init__(self, hidden_size: int, intermediate_size: int):
+    def __init__(
+        self,
+        hidden_size: int,
+        intermediate_size: int,
+        dtype: torch.dtype,
+        device: str,
+    ):
         super().__init__()
-        self.gate_proj = nn.Linear(hidden_size, intermediate_size, bias=False)
-        self.up_proj = nn.Linear(hidden_size, intermediate_size, bias=False)
-        self.down_proj = nn.Linear(intermediate_size, hidden_size, bias=False)
+        self.gate_proj = nn.Linear(
+            hidden_size, intermediate_size, bias=False, dtype=dtype, device=device
+        )
+        self.up_proj = nn.Linear(
+            hidden_size, intermediate_size, bias=False, dtype=dtype, device=device
+        )
+        self.down_proj = nn.Linear(
+            intermediate_size, hidden_size, bias=False, dtype=dtype, device=device
+        )
 
     def forward(self, hidden_states: torch.Tensor) -> torch.Tensor:
         return self.down_proj(
@@ -36,26 +50,47 @@ class SwiGLU(nn.Module):
 
 
 def _group_sizes_from_offsets(offsets: torch.Tensor) -> list[int]:
-    group_sizes = []
-    prev = 0
-    for offset in offsets:
-        group_sizes.append(offset - prev)
-        prev = offset
-    return group_sizes
+    # One kernel and one device-to-host copy instead of a scalar read per
+    # group.
+    return torch.diff(offsets, prepend=offsets.new_zeros(1)).tolist()
 
 
 # Required otherwise, there is a graph-break.
 _grouped_mm = torch.compiler.allow_in_graph(torch._grouped_mm)
 
 
+def _supports_grouped_mm(a: torch.Tensor, group_sizes: list[int]) -> bool:
+    # torch._grouped_mm runs bf16 on Hopper and requires every group size to
+    # be a multiple of 16.
+    return (
+        a.is_cuda
+        and a.dtype == torch.bfloat16
+        and torch.cuda.get_device_capability(a.device)[0] == 9
+        and all(size % 16 == 0 for size in group_sizes)
+    )
+
+
 # This function should be replaced with torch._grouped_mm.  However,
-# torch._grouped_mm is yet to be usable because it requires offsets being
-# multiples of 16.
-def grouped_mm(a: torch.Tensor, b: torch.Tensor, offsets: torch.Tensor) -> torch.Tensor:
+# torch._grouped_mm is yet to be usable in general because it requires offsets
+# being multiples of 16. Until then, it's used only when offsets happen to be
+# aligned and we fall back to one matmul per group otherwise.
+#
+# `group_sizes` can be passed in by callers that issue several grouped_mms with
+# the same offsets so they are copied to the host only once.
+def grouped_mm(
+    a: torch.Tensor,
+    b: torch.Tensor,
+    offsets: torch.Tensor,
+    group_sizes: list[int] | None = None,
+) -> torch.Tensor:
     if torch.compiler.is_compiling():
         return _grouped_mm(a, b, offsets)
 
-    group_sizes = _group_sizes_from_offsets(offsets)
+    if group_sizes is None:
+        group_sizes = _group_sizes_from_offsets(offsets)
+    if _supports_grouped_mm(a, group_sizes):
+        return torch._grouped_mm(a, b, offsets)
+
     group_outs = []
     for group_a, group_b in zip(a.split(group_sizes), b.unbind()):
         group_outs.append(group_a @ group_b)
@@ -63,32 +98,66 @@ def grouped_mm(a: torch.Tensor, b: torch.Tensor, offsets: torch.Tensor) -> torch
 
 
 class GroupedLinear(nn.Module):
-    def __init__(self, groups: int, in_features: int, out_features: int):
+    def __init__(
+        self,
+        groups: int,
+        in_features: int,
+        out_features: int,
+        dtype: torch.dtype,
+        device: str,
+    ):
         super().__init__()
-        self.weight = nn.Parameter(torch.empty(groups, in_features, out_features))
+        self.weight = nn.Parameter(
+            torch.empty(groups, in_features, out_features, dtype=dtype, device=device)
+        )
         # Initialize the weight in the same way as nn.Linear
         nn.init.kaiming_uniform_(self.weight, a=math.sqrt(5))
 
     def forward(
-        self, hidden_states: torch.Tensor, offsets: torch.Tensor
+        self,
+        hidden_states: torch.Tensor,
+        offsets: torch.Tensor,
+        group_sizes: list[int] | None = None,
     ) -> torch.Tensor:
-        return grouped_mm(hidden_states, self.weight, offsets)
+        return grouped_mm(hidden_states, self.weight, offsets, group_sizes)
 
 
 class GroupedSwiGLU(nn.Module):
-    def __init__(self, groups: int, hidden_size: int, intermediate_size: int):
+    def __init__(
+        self,
+        groups: int,
+        hidden_size: int,
+        intermediate_size: int,
+        dtype: torch.dtype,
+        device: str,
+    ):
         super().__init__()
-        self.gate_proj = GroupedLinear(groups, hidden_size, intermediate_size)
-        self.up_proj = GroupedLinear(groups, hidden_size, intermediate_size)
-        self.down_proj = GroupedLinear(groups, intermediate_size, hidden_size)
+        self.gate_proj = GroupedLinear(
+            groups, hidden_size, intermediate_size, dtype, device
+        )
+        self.up_proj = GroupedLinear(
+            groups, hidden_size, intermediate_size, dtype, device
+        )
+        self.down_proj = GroupedLinear(
+            groups, intermediate_size, hidden_size, dtype, device
+        )
 
     def forward(
         self, hidden_states: torch.Tensor, offsets: torch.Tensor
     ) -> torch.Tensor:
+        # All three projections share the same offsets, so compute the group
+        # sizes once. They are not needed when compiling because _grouped_mm
+        # takes the offsets directly.
+        group_sizes = (
+            None
+            if torch.compiler.is_compiling()
+            else _group_sizes_from_offsets(offsets)
+        )
         return self.down_proj(
-            F.silu(self.gate_proj(hidden_states, offsets))
-            * self.up_proj(hidden_states, offsets),
+            F.silu(self.gate_proj(hidden_states, offsets, group_sizes))
+            * self.up_proj(hidden_states, offsets, group_sizes),
             offsets,
+            group_sizes,
         )
 
 
@@ -96,12 +165,25 @@ class Llama4MoE(nn.Module):
     def __init__(self, config: Config):
         super().__init__()
         self.config = config
-        self.gate = nn.Linear(config.hidden_size, config.num_routed_experts, bias=False)
+        self.gate = nn.Linear(
+            config.hidden_size,
+            config.num_routed_experts,
+            bias=False,
+            dtype=config.dtype,
+            device=config.device,
+        )
         self.shared_experts = SwiGLU(
-            config.hidden_size, config.intermediate_size * config.num_shared_experts
+            config.hidden_size,
+            config.intermediate_size * config.num_shared_experts,
+            config.dtype,
+            config.device,
         )
         self.routed_experts = GroupedSwiGLU(
-            config.num_routed_experts, config.hidden_size, config.intermediate_size
+            config.num_routed_experts,
+            config.hidden_size,
+            config.intermediate_size,
+            config.dtype,
+            config.device,
         )
 
     def run_routed_experts(self, hidden_states: torch.Tensor) -> torch.Tensor:
@@ -149,30 +231,44 @@ class Llama4MoE(nn.Module):
         )
 
 
-@contextmanager
-def default_tensor_type(dtype=torch.float32, device="cpu"):
-    # Save
-    prev_dtype = torch.get_default_dtype()
-    prev_device = torch.get_default_device()
-
-    # Set
-    torch.set_default_dtype(dtype)
-    torch.set_default_device(device)
-
-    yield
+# Checked at collection time, so guard against hosts without CUDA.
+@pytest.mark.skipif(
+    not torch.cuda.is_available() or torch.cuda.get_device_capability()[0] != 9,
+    reason="grouped_mm uses torch._grouped_mm only on Hopper.",
+)
+def test_grouped_mm_aligned_offsets():
+    # Every group size is a multiple of 16, so grouped_mm takes the
+    # torch._grouped_mm path. Randomly routed tokens in the MoE test below
+    # practically never are.
+    group_sizes = [16, 48, 32, 64]
+    in_features, out_features = 128, 64
+    a = torch.randn(sum(group_sizes), in_features, dtype=torch.bfloat16, device="cuda")
+    b = torch.randn(
+        len(group_sizes), in_features, out_features, dtype=torch.bfloat16, device="cuda"
+    )
+    offsets = torch.cumsum(
+        torch.tensor(group_sizes, device="cuda"), 0, dtype=torch.int32
+    )
+    assert _supports_grouped_mm(a, group_sizes)
 
-    # Restore
-    torch.set_default_dtype(prev_dtype)
-    torch.set_default_device(prev_device)
+    expected = torch.cat(
+        [
+            group_a @ group_b
+            for group_a, group_b in zip(a.split(group_sizes), b.unbind())
+        ]
+    )
+    torch.testing.assert_close(
+        grouped_mm(a, b, offsets), expected, atol=1e-2, rtol=1e-2
+    )
 
 
 def test_llama4_moe_thunderfx():
     config = Config()
 
+    # Parameters are created directly with `config.dtype` and `config.device`.
     # This is much faster than creating the module with CPU float parameters
     # and then doing `.to("cuda").to(torch.bfloat16)`.
-    with default_tensor_type(dtype=torch.bfloat16, device="cuda"):
-        model = Llama4MoE(config)
+    model = Llama4MoE(config)
 
     # Without this, `thunderfx` falls back to `inductor` for `_grouped_mm`
     # as it doesn't have a grad-rule for the same.
@@ -180,7 +276,11 @@ def test_llama4_moe_thunderfx():
 
     batch_size, seq_len = 1, 2048
     inp = torch.randn(
-        batch_size, seq_len, config.hidden_size, dtype=torch.bfloat16, device="cuda"
+        batch_size,
+        seq_len,
+        config.hidden_size,
+        dtype=config.dtype,
+        device=config.device,
     )
     expected = model(inp)
 
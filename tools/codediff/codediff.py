@@ -14,18 +14,47 @@ Example usage:
             codegen_comparison/{$commit1,$commit2}/binary_tests
 """
 
-from dataclasses import asdict, dataclass, field, InitVar
+from dataclasses import dataclass, field, fields, InitVar
 import difflib
 from enum import Enum
+import functools
+import io
 import os
 import re
 import subprocess
 import sys
+from typing import Callable, TextIO
 
 import cxxfilt
 from dataclasses_json import dataclass_json
 
 
+@functools.cache
+def describe_git_rev(full_hash: str) -> tuple[str, ...]:
+    """Return the abbreviated hash, title, author name, author email, author
+    time and commit time of a commit. Results are cached since the same commit
+    is usually described by several runs and by the HTML report.
+    """
+    # Query all fields with a single git process. Fields are separated by
+    # NUL bytes since titles and names may contain any printable character.
+    out = (
+        subprocess.run(
+            [
+                "git",
+                "show",
+                "--no-patch",
+                "--format=%h%x00%s%x00%an%x00%ae%x00%ad%x00%cd",
+                full_hash,
+            ],
+            capture_output=True,
+        )
+        .stdout.strip()
+        .decode("utf-8")
+    )
+    # If the hash is unknown to git, leave every field empty
+    return tuple(out.split("\0")) if out else ("",) * 6
+
+
 @dataclass_json
 @dataclass
 class GitRev:
@@ -43,54 +72,14 @@ class GitRev:
             # Avoid running __post_init__ during deserialization
             return
 
-        self.abbrev = (
-            subprocess.run(
-                ["git", "rev-parse", "--short", self.full_hash], capture_output=True
-            )
-            .stdout.strip()
-            .decode("utf-8")
-        )
-        for line in (
-            subprocess.run(
-                ["git", "branch", "--quiet", "--color=never", self.full_hash],
-                capture_output=True,
-            )
-            .stdout.strip()
-            .decode("utf-8")
-            .splitlines()
-        ):
-            # Possible output:
-            #
-            #     main
-            #     * scalar_seg_edges
-            #
-            # In this case, we have checked out the HEAD of the
-            # scalar_seg_edges branch. Here we just strip the *.
-            if line[0] == "*":
-                line = line[2:]
-                in_branches.append(line)
-
-        def git_show(fmt) -> str:
-            return (
-                subprocess.run(
-                    [
-                        "git",
-                        "show",
-                        "--no-patch",
-                        f"--format={fmt}",
-                        self.full_hash,
-                    ],
-                    capture_output=True,
-                )
-                .stdout.strip()
-                .decode("utf-8")
-            )
-
-        self.title = git_show("%s")
-        self.author_name = git_show("%an")
-        self.author_email = git_show("%ae")
-        self.author_time = git_show("%ad")
-        self.commit_time = git_show("%cd")
+        (
+            self.abbrev,
+            self.title,
+            self.author_name,
+            self.author_email,
+            self.author_time,
+            self.commit_time,
+        ) = describe_git_rev(self.full_hash)
 
 
 @dataclass_json
@@ -101,8 +90,28 @@ class LaunchParams:
     dynamic_smem_bytes: int
 
 
+# Patterns for the ptxas and launch parameter output associated with a kernel
+ptxas_entry_pattern = re.compile(r"Compiling entry function '(.*)' for '(.*)'")
+# Each group is named after the CompiledKernel field it fills in
+ptxas_counter_pattern = re.compile(
+    r"(?P<stack_frame_bytes>\d+) bytes stack frame"
+    r"|(?P<spill_store_bytes>\d+) bytes spill stores"
+    r"|(?P<spill_load_bytes>\d+) bytes spill loads"
+    r"|(?P<registers>\d+) registers"
+    r"|(?P<gmem_bytes>\d+) bytes gmem"
+    r"|(?P<smem_bytes>\d+) bytes smem"
+)
+cmem_pattern = re.compile(r"(\d+) bytes cmem\[(\d+)\]")
+launch_params_pattern = re.compile(
+    r"Launch Parameters: BlockDim.x = (.*), BlockDim.y = (.*), BlockDim.z = (.*), "
+    r"GridDim.x = (.*), GridDim.y = (.*), GridDim.z = (.*), Smem Size = (.*)$"
+)
+
+
+# There is one of these per kernel, so use slots to avoid a __dict__ per
+# instance on runs with many kernels
 @dataclass_json
-@dataclass
+@dataclass(slots=True)
 class CompiledKernel:
     filename: str
     code: str | None = None
@@ -148,57 +157,49 @@ class CompiledKernel:
         if self.ptxas_info is None:
             return
 
-        m = re.search(r"Compiling entry function '(.*)' for '(.*)'", self.ptxas_info)
+        m = ptxas_entry_pattern.search(self.ptxas_info)
         if m is not None:
             self.mangled_name, self.arch = m.groups()
 
-        def find_unique_int(pattern) -> int | None:
-            assert self.ptxas_info is not None
-            m = re.search(pattern, self.ptxas_info)
-            return 0 if m is None else int(m.groups()[0])
-
-        self.stack_frame_bytes = find_unique_int(r"(\d+) bytes stack frame")
-        self.spill_store_bytes = find_unique_int(r"(\d+) bytes spill stores")
-        self.spill_load_bytes = find_unique_int(r"(\d+) bytes spill loads")
-        self.registers = find_unique_int(r"(\d+) registers")
-        self.gmem_bytes = find_unique_int(r"(\d+) bytes gmem")
-        self.smem_bytes = find_unique_int(r"(\d+) bytes smem")
-
-        self.cmem_bank_bytes = []
-        cmem_banks = 0
-        for m in re.finditer(r"(\d+) bytes cmem\[(\d+)\]", self.ptxas_info):
+        # Find all counters in a single pass. Like before, the first
+        # occurrence of each counter is used and missing counters are 0.
+        counters: dict[str, int] = {}
+        for m in ptxas_counter_pattern.finditer(self.ptxas_info):
+            counters.setdefault(m.lastgroup, int(m[m.lastgroup]))
+        self.stack_frame_bytes = counters.get("stack_frame_bytes", 0)
+        self.spill_store_bytes = counters.get("spill_store_bytes", 0)
+        self.spill_load_bytes = counters.get("spill_load_bytes", 0)
+        self.registers = counters.get("registers", 0)
+        self.gmem_bytes = counters.get("gmem_bytes", 0)
+        self.smem_bytes = counters.get("smem_bytes", 0)
+
+        # Collect the banks first so the list is sized only once. Unused banks
+        # below the largest one are reported as 0 bytes.
+        bank_bytes: dict[int, int] = {}
+        for m in cmem_pattern.finditer(self.ptxas_info):
             nbytes_str, bank_str = m.groups()
-            bank = int(bank_str)
-            if len(self.cmem_bank_bytes) <= bank:
-                self.cmem_bank_bytes += [0] * (bank + 1 - len(self.cmem_bank_bytes))
-            self.cmem_bank_bytes[bank] = int(nbytes_str)
-            cmem_banks += 1
+            bank_bytes[int(bank_str)] = int(nbytes_str)
+        self.cmem_bank_bytes = [
+            bank_bytes.get(bank, 0) for bank in range(max(bank_bytes, default=-1) + 1)
+        ]
 
     def parse_launch_params(self):
         # If NVFUSER_DUMP=launch_param is given we will get a line like this for every launch:
         #   Launch Parameters: BlockDim.x = 32, BlockDim.y = 2, BlockDim.z = 2, GridDim.x = 8, GridDim.y = 8, GridDim.z = -1, Smem Size = 49152
         # This is not done by default since we might have hundreds of thousands of these lines.
         # Still, if we recognize it, we will parse this info. If there are
-        # multiple lines, we just check that they are all equal and if not then
-        # we keep the first version and print a warning.
+        # multiple lines, we keep the first version even if they mismatch, so
+        # only the first line needs to be parsed.
         if self.launch_params_str is None:
             return
 
         self.launch_params = None
-        for line in self.launch_params_str.splitlines():
-            m = re.search(
-                r"Launch Parameters: BlockDim.x = (.*), BlockDim.y = (.*), BlockDim.z = (.*), "
-                r"GridDim.x = (.*), GridDim.y = (.*), GridDim.z = (.*), Smem Size = (.*)$",
-                line,
-            )
-            bx, by, bz, gx, gy, gz, s = m.groups()
-            lp = LaunchParams((bx, by, bz), (gx, gy, gz), s)
-            if self.launch_params is None:
-                self.launch_params = lp
-            else:
-                if lp != self.launch_params:
-                    # Found multiple mismatched launch params for one kernel. Only using first
-                    return
+        first_line, _, _ = self.launch_params_str.partition("\n")
+        if len(first_line) == 0:
+            return
+        m = launch_params_pattern.search(first_line)
+        bx, by, bz, gx, gy, gz, s = m.groups()
+        self.launch_params = LaunchParams((bx, by, bz), (gx, gy, gz), s)
 
 
 @dataclass_json
@@ -275,8 +276,9 @@ class LogParser:
 
     def reset_kernel_state(self):
         self.current_file = None
-        self.ptxas_info = ""
-        self.launch_params_str = ""
+        # Lines are collected in lists and joined once the kernel is finalized
+        self.ptxas_info: list[str] = []
+        self.launch_params_str: list[str] = []
 
     def reset_test_state(self):
         """Initialize temporary variables used during parsing pass"""
@@ -285,17 +287,24 @@ class LogParser:
         self.kernels = []
 
     def parse(self, log_file: str):
-        for line in open(log_file, "r").readlines():
-            line = self.ansi_re.sub("", line.rstrip())
-            self.parse_line(line)
+        # Iterate over the file instead of calling readlines() so that logs with
+        # many launch parameter lines are not held in memory all at once
+        with open(log_file, "r") as f:
+            for line in f:
+                line = line.rstrip()
+                # Most lines carry no color codes, so only run the regex on
+                # lines that contain an escape character
+                if "\x1b" in line or "\x9b" in line:
+                    line = self.ansi_re.sub("", line)
+                self.parse_line(line)
         self.finalize()
 
     def finalize_kernel(self):
         if self.current_file is not None:
             k = CompiledKernel(
                 self.current_file,
-                ptxas_info=self.ptxas_info,
-                launch_params_str=self.launch_params_str,
+                ptxas_info="".join(self.ptxas_info),
+                launch_params_str="".join(self.launch_params_str),
             )
             self.kernels.append(k)
         self.reset_kernel_state()
@@ -315,25 +324,25 @@ class LogParser:
 
     def parse_line(self, line):
         """Parse a line of log. Return True if consumed"""
-        if line[:10] == "PRINTING: ":
-            if line[-3:] == ".cu":
+        if line.startswith("PRINTING: "):
+            if line.endswith(".cu"):
                 self.finalize_kernel()
                 # This avoids comparing the .ptx files that are created then
                 # removed by the MemoryTest.LoadCache tests
                 self.current_file = line[10:]
-        elif line[:6] == "ptxas ":
+        elif line.startswith("ptxas "):
             # NVFUSER_DUMP=ptxas_verbose corresponds to nvcc --ptxas-options=-v
             # or --resources-usage. This always prints after printing the cuda
             # filename
             if self.current_file is None:
                 print("WARNING: Cannot associate ptxas info with CUDA kernel")
                 return False
-            self.ptxas_info += line + "\n"
-        elif line[:19] == "Launch Parameters: ":
+            self.ptxas_info.append(line + "\n")
+        elif line.startswith("Launch Parameters: "):
             if self.current_file is None:
                 print("WARNING: Cannot associate launch params with CUDA kernel")
                 return False
-            self.launch_params_str += line + "\n"
+            self.launch_params_str.append(line + "\n")
         else:
             return False
         return True
@@ -346,11 +355,11 @@ class LogParserGTest(LogParser):
         if super().parse_line(line):
             return True
 
-        if line[:13] == "[ RUN      ] ":
+        if line.startswith("[ RUN      ] "):
             self.current_test = line[13:]
-        elif line[:13] == "[       OK ] ":
+        elif line.startswith("[       OK ] "):
             self.finalize_test(True)
-        elif line[:13] == "[  FAILED  ] ":
+        elif line.startswith("[  FAILED  ] "):
             if self.current_test is not None and self.current_file is not None:
                 # Avoid the summary of failed tests, such as
                 #   [  FAILED  ] 1 test, listed below:
@@ -378,7 +387,7 @@ class LogParserGBench(LogParser):
         if super().parse_line(line):
             return True
 
-        m = re.match(self.result_re, line)
+        m = self.result_re.match(line)
         if m is not None:
             d = m.groupdict()
             self.current_test = d["testname"]
@@ -425,13 +434,13 @@ class LogParserPyTest(LogParser):
 
     def parse_line(self, line):
         if self.all_test_names is None:
-            m = re.match(self.itemlist_re, line)
+            m = self.itemlist_re.match(line)
             if m is not None:
                 # grab the test list
                 self.all_test_names = m.groups()[0].split(", ")
                 return True
 
-        m = re.match(self.wildcard_testname_re, line)
+        m = self.wildcard_testname_re.match(line)
         if m is not None:
             d = m.groupdict()
             self.current_test = d["testname"]
@@ -448,6 +457,13 @@ class LogParserPyTest(LogParser):
         return False
 
 
+# Patterns for the environment and CUDA files written by run_command.sh
+testdir_pattern = re.compile(r"^testdir=")
+kernel_definition_pattern = re.compile(r"void (nvfuser|kernel)_?\d+\b")
+index_type_pattern = re.compile(r"typedef\s+(\S*)\s+nvfuser_index_t;")
+kernel_name_pattern = re.compile(r"\bnvfuser_\d+\b")
+
+
 @dataclass_json
 @dataclass
 class TestRun:
@@ -516,7 +532,7 @@ class TestRun:
             for line in open(os.path.join(self.directory, "env"), "r").readlines():
                 # remove $testdir which is set by compare_codegen.sh
                 # NOTE: compare_codegen.sh should have already removed these lines
-                if re.search(r"^testdir=", line) is None:
+                if testdir_pattern.search(line) is None:
                     self.env += line
         except FileNotFoundError:
             self.env = None
@@ -569,29 +585,37 @@ class TestRun:
         preamble_lines = []
         first = True
         files_processed = 0  # limit how many files to check
-        for cufile in os.listdir(os.path.join(self.directory, "cuda")):
-            cufile_full = os.path.join(self.directory, "cuda", cufile)
-            with open(cufile_full, "r") as f:
-                for i, line in enumerate(f.readlines()):
+        # scandir yields entries lazily with their full paths, so we do not list
+        # the whole directory when stopping after the first few files
+        with os.scandir(os.path.join(self.directory, "cuda")) as entries:
+            for entry in entries:
+                with open(entry.path, "r") as f:
+                    code = f.read()
+                # Search the whole file once for the kernel definition instead of
+                # every line. Only the lines before it can be part of the preamble.
+                m = kernel_definition_pattern.search(code)
+                end = len(code) if m is None else code.rfind("\n", 0, m.start()) + 1
+                lines = code[:end].split("\n")[:-1]
+                for i, line in enumerate(lines):
                     line = line.rstrip()
                     # we set nvfuser_index_t in the preamble. We ignore that change for the purposes of this diff
                     if line[:8] == "typedef " and line[-17:] == " nvfuser_index_t;":
                         line = "typedef int nvfuser_index_t; // NOTE: index type hard-coded as int for display only"
-                    if re.search(r"void (nvfuser|kernel)_?\d+\b", line) is not None:
-                        # we arrived at the kernel definition
-                        break
                     if first:
                         preamble_lines.append(line)
                     elif i >= len(preamble_lines) or preamble_lines[i] != line:
                         break
+                else:
+                    # we arrived at the kernel definition
+                    i = len(lines)
                 preamble_lines = preamble_lines[:i]
-            if len(preamble_lines) == 0:
-                # early return if preamble is determined to be empty
-                break
-            first = False
-            files_processed += 1
-            if files_processed >= 50:
-                break
+                if len(preamble_lines) == 0:
+                    # early return if preamble is determined to be empty
+                    break
+                first = False
+                files_processed += 1
+                if files_processed >= 50:
+                    break
         self.preamble_size_lines = len(preamble_lines)
         self.preamble = "\n".join(preamble_lines)
 
@@ -604,18 +628,17 @@ class TestRun:
         if kern.code is not None:
             return kern
         fullname = os.path.join(self.directory, "cuda", basename)
-        kern.code = ""
         with open(fullname, "r") as f:
-            for i, line in enumerate(f.readlines()):
-                if kern.index_type is None:
-                    m = re.search(r"typedef\s+(\S*)\s+nvfuser_index_t;", line)
-                    if m is not None:
-                        kern.index_type = m.groups()[0]
-                if not strip_preamble or i >= self.preamble_size_lines:
-                    # replace kernel934 with kernel1 to facilitate diffing
-                    # also match kernel_43 to handle new-style naming with static fusion count
-                    kern.code += re.sub(r"\bnvfuser_\d+\b", "nvfuser_N", line)
-        kern.code = kern.code.rstrip()
+            lines = f.readlines()
+        if kern.index_type is None:
+            m = index_type_pattern.search("".join(lines))
+            if m is not None:
+                kern.index_type = m.groups()[0]
+        if strip_preamble:
+            lines = lines[self.preamble_size_lines :]
+        # replace kernel934 with kernel1 to facilitate diffing
+        # also match kernel_43 to handle new-style naming with static fusion count
+        kern.code = kernel_name_pattern.sub("nvfuser_N", "".join(lines)).rstrip()
         if strip_preamble and kern.code[-1] == "}":
             # trailing curly brace is close of namespace. This will clean it up so that we have just the kernel
             kern.code = kern.code[:-1].rstrip()
@@ -731,6 +754,8 @@ filename_pattern = re.compile(r"__tmp_\w+")
 kernel_pattern = re.compile(r"(?P<prefix>kernel|nvfuser)_\d+")
 
 
+# The same symbols, e.g. kernel parameters, appear many times in a PTX file
+@functools.cache
 def sanitize_symbol_name(symb: str) -> str:
     """
     Replace mangled kernel names like
@@ -763,28 +788,47 @@ def sanitize_symbol_name(symb: str) -> str:
             suffix = symb[-1] + suffix
             symb = symb[:-1]
     # Replace "__tmp_kernel_pointwise_f0_c1_r0_g0_cu" or "__tmp_kernel_4" with "__tmp_filename"
-    d = re.sub(filename_pattern, "__tmp_filename", d)
+    d = filename_pattern.sub("__tmp_filename", d)
     # Replace "kernel_4" or "nvfuser_8" with "kernel_N"
-    d = re.sub(kernel_pattern, lambda m: f"{m.groupdict()['prefix']}_N", d)
+    d = kernel_pattern.sub(lambda m: f"{m.groupdict()['prefix']}_N", d)
     return d + suffix
 
 
 # Mangled symbol names start with _Z in the Itanium ABI
 # https://itanium-cxx-abi.github.io/cxx-abi/abi.html#mangling
 symbol_pattern = re.compile(r"\b_Z\w+\b")
-comment_pattern = re.compile(r"//.*$")
+comment_pattern = re.compile(r"//.*$", re.MULTILINE)
 
 
-def sanitize_ptx_lines(lines: list[str]) -> list[str]:
+def sanitize_ptx_text(text: str) -> str:
     """Remove comments and remove kernel id"""
-    sanitary_lines = []
-    for l in lines:
-        l = re.sub(symbol_pattern, lambda m: sanitize_symbol_name(m.group()), l)
+    # Substitute over the whole text at once instead of line by line. Neither
+    # pattern matches across lines.
+    #
+    # Remove comments. This fixes mismatches in PTX "callseq" comments, which appear to be non-repeatable.
+    text = comment_pattern.sub("", text)
+
+    return symbol_pattern.sub(lambda m: sanitize_symbol_name(m.group()), text)
 
-        # Remove comments. This fixes mismatches in PTX "callseq" comments, which appear to be non-repeatable.
-        l = re.sub(comment_pattern, "", l)
-        sanitary_lines.append(l)
-    return sanitary_lines
+
+@functools.cache
+def git_head_hash() -> str:
+    return (
+        subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True)
+        .stdout.strip()
+        .decode("utf-8")
+    )
+
+
+@functools.cache
+def load_report_template():
+    """Load and compile the HTML report template once per process"""
+    import jinja2
+
+    tools_dir = os.path.dirname(__file__)
+    template_dir = os.path.join(tools_dir, "templates")
+    env = jinja2.Environment(loader=jinja2.FileSystemLoader(searchpath=template_dir))
+    return env.get_template("codediff.html")
 
 
 @dataclass_json
@@ -819,25 +863,18 @@ class TestDifferences:
             )
 
         self.preamble_diff = "\n".join(
-            difflib.unified_diff(
-                self.run1.preamble.splitlines(),
-                self.run2.preamble.splitlines(),
-                fromfile=self.run1.name,
-                tofile=self.run2.name,
-                n=5,
-            )
+            self.unified_diff(self.run1.preamble, self.run2.preamble)
         )
         if len(self.preamble_diff) > 0:
             print("Preambles differ between runs indicating changes to runtime files")
 
-        self.env_diff = "\n".join(
-            difflib.unified_diff(
-                self.run1.env.splitlines(),
-                self.run2.env.splitlines(),
-                fromfile=self.run1.name,
-                tofile=self.run2.name,
-                n=5,
-            )
+        self.env_diff = "\n".join(self.unified_diff(self.run1.env, self.run2.env))
+
+        include_all = kernel_inclusion_criterion == "all"
+        include_cuda = kernel_inclusion_criterion == "mismatched_cuda_or_ptx"
+        include_ptx = kernel_inclusion_criterion in (
+            "mismatched_cuda_or_ptx",
+            "mismatched_ptx",
         )
 
         for testname, compiled_test1 in self.run1.kernel_map.items():
@@ -879,38 +916,15 @@ class TestDifferences:
 
                 ptx_diff_lines = None
                 if kern1.ptx is not None and kern2.ptx is not None:
-                    ptx_diff_lines = list(
-                        difflib.unified_diff(
-                            sanitize_ptx_lines(kern1.ptx.splitlines()),
-                            sanitize_ptx_lines(kern2.ptx.splitlines()),
-                            fromfile=self.run1.name,
-                            tofile=self.run2.name,
-                            n=5,
-                        )
+                    ptx_diff_lines = self.unified_diff(
+                        kern1.ptx, kern2.ptx, sanitize=sanitize_ptx_text
                     )
 
-                diff_lines = list(
-                    difflib.unified_diff(
-                        kern1.code.splitlines(),
-                        kern2.code.splitlines(),
-                        fromfile=self.run1.name,
-                        tofile=self.run2.name,
-                        n=5,
-                    )
-                )
+                diff_lines = self.unified_diff(kern1.code, kern2.code)
                 if (
-                    kernel_inclusion_criterion == "all"
-                    or (
-                        kernel_inclusion_criterion == "mismatched_cuda_or_ptx"
-                        and diff_lines is not None
-                        and len(diff_lines) > 0
-                    )
-                    or (
-                        kernel_inclusion_criterion
-                        in ["mismatched_cuda_or_ptx", "mismatched_ptx"]
-                        and ptx_diff_lines is not None
-                        and len(ptx_diff_lines) > 0
-                    )
+                    include_all
+                    or (include_cuda and diff_lines)
+                    or (include_ptx and ptx_diff_lines)
                 ):
                     kd = KernelDiff(
                         testname,
@@ -943,6 +957,33 @@ class TestDifferences:
                 ]
                 self.new_tests.append(compiled_test2)
 
+    def unified_diff(
+        self,
+        text1: str,
+        text2: str,
+        sanitize: Callable[[str], str] | None = None,
+    ) -> list[str]:
+        """Return the lines of a unified diff between text from run1 and run2.
+
+        Most compared texts are identical, so they are checked for equality
+        before running difflib, which is slow on long inputs. If given,
+        sanitize is applied to each text before it is split into lines.
+        """
+        if text1 == text2:
+            return []
+        if sanitize is not None:
+            text1 = sanitize(text1)
+            text2 = sanitize(text2)
+        return list(
+            difflib.unified_diff(
+                text1.splitlines(),
+                text2.splitlines(),
+                fromfile=self.run1.name,
+                tofile=self.run2.name,
+                n=5,
+            )
+        )
+
     def hide_env(self):
         """Remove private information like env vars and lib versions"""
         self.run1.env = None
@@ -952,37 +993,26 @@ class TestDifferences:
 
     def generate_html(self, omit_preamble: bool, max_diffs: bool) -> str:
         """Return a self-contained HTML string summarizing the codegen comparison"""
-        import jinja2
-
-        tools_dir = os.path.dirname(__file__)
-        template_dir = os.path.join(tools_dir, "templates")
-        env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader(searchpath=template_dir)
-        )
-        template = env.get_template("codediff.html")
-        # dict_factory lets us provide custom serializations for classes like Enums
-        # https://stackoverflow.com/questions/61338539/how-to-use-enum-value-in-asdict-function-from-dataclasses-module
-        context = asdict(
-            self,
-            dict_factory=lambda data: {
-                # Serialize CommandType as string so that jinja can recognize it
-                field: value.name if isinstance(value, CommandType) else value
-                for field, value in data
-            },
-        )
+        f = io.StringIO()
+        self.write_html(f, omit_preamble=omit_preamble, max_diffs=max_diffs)
+        return f.getvalue()
+
+    def write_html(self, f: TextIO, omit_preamble: bool, max_diffs: bool):
+        """Write the HTML report to f as it is rendered, without building it as
+        one string first"""
+        template = load_report_template()
+        # Pass the fields as they are instead of deep-copying everything with
+        # asdict. Jinja looks up attributes and dict items alike, and
+        # CommandType is a str Enum, so it compares equal to its name.
+        context = {fd.name: getattr(self, fd.name) for fd in fields(self)}
         context["omit_preamble"] = omit_preamble
         context["max_diffs"] = max_diffs
-        head_hash = (
-            subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True)
-            .stdout.strip()
-            .decode("utf-8")
-        )
-        context["tool_git"] = GitRev(head_hash)
+        context["tool_git"] = GitRev(git_head_hash())
         context["explain_api_url"] = os.environ.get(
             "CODEDIFF_EXPLAIN_API_URL", "/api/explain-diff"
         )
 
-        return template.render(context)
+        template.stream(context).dump(f)
 
 
 if __name__ == "__main__":
@@ -1126,11 +1156,7 @@ if __name__ == "__main__":
             td.hide_env()
 
         with open(args.output_html, "w") as f:
-            f.write(
-                td.generate_html(
-                    omit_preamble=args.omit_preamble, max_diffs=args.max_diffs
-                )
-            )
+            td.write_html(f, omit_preamble=args.omit_preamble, max_diffs=args.max_diffs)
 
     report_parser.set_defaults(func=diff_report)
 
@@ -88,10 +88,10 @@ if __name__ == "__main__":
             run_name = os.path.basename(os.path.abspath(args.dir1))
             output_file = f"codediff_{abbrev1}_{abbrev2}_{run_name}.html"
         with open(output_file, "w") as f:
-            f.write(
-                td.generate_html(
-                    omit_preamble=args.html_omit_preamble, max_diffs=args.html_max_diffs
-                )
+            td.write_html(
+                f,
+                omit_preamble=args.html_omit_preamble,
+                max_diffs=args.html_max_diffs,
             )
 
     if args.json is not None: